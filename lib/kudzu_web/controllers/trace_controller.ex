@@ -54,6 +54,38 @@ defmodule KudzuWeb.TraceController do
     end
   end
 
+  @doc """
+  Fetch traces from several holograms in one request.
+  POST /api/v1/traces/search
+
+  Body: `{"hologram_ids": [...], "limit": 50, "purpose": "learning"}`
+  (`limit` and `purpose` are optional). Traces come back grouped by
+  hologram ID; IDs with no running hologram, or whose hologram dies
+  mid-request, are listed under `missing`.
+  """
+  def search(conn, %{"hologram_ids" => ids} = params) when is_list(ids) do
+    purpose_filter = Map.get(params, "purpose")
+    limit = params |> Map.get("limit") |> to_limit()
+
+    {found, missing} =
+      Enum.reduce(ids, {%{}, []}, fn id, {found, missing} ->
+        with {:ok, pid} <- find_hologram(id),
+             {:ok, traces} <- recall_all(pid) do
+          traces =
+            traces
+            |> filter_by_purpose(purpose_filter)
+            |> Enum.take(limit)
+            |> Enum.map(&trace_to_map/1)
+
+          {Map.put(found, id, traces), missing}
+        else
+          :error -> {found, [id | missing]}
+        end
+      end)
+
+    json(conn, %{traces: found, missing: Enum.reverse(missing)})
+  end
+
   @doc """
   Share a trace between holograms.
   POST /api/v1/traces/share
@@ -98,6 +130,27 @@ defmodule KudzuWeb.TraceController do
     }
   end
 
+  # A pid from the registry can die before we call it; GenServer.call then
+  # exits rather than raising, so catch exits as well as exceptions.
+  defp recall_all(pid) do
+    {:ok, Hologram.recall_all(pid)}
+  rescue
+    _ -> :error
+  catch
+    :exit, _ -> :error
+  end
+
+  # JSON bodies may carry the limit as an integer, float, string or null
+  defp to_limit(value) when is_integer(value) and value >= 0, do: value
+  defp to_limit(value) when is_float(value) and value >= 0, do: trunc(value)
+  defp to_limit(value) when is_binary(value) do
+    case Integer.parse(value) do
+      {limit, _} when limit >= 0 -> limit
+      _ -> 100
+    end
+  end
+  defp to_limit(_), do: 100
+
   defp filter_by_purpose(traces, nil), do: traces
   defp filter_by_purpose(traces, purpose) do
     purpose_atom = String.to_existing_atom(purpose)
@@ -42,6 +42,7 @@ defmodule KudzuWeb.Router do
       get "/", TraceController, :index
       get "/:id", TraceController, :show
       post "/share", TraceController, :share
+      post "/search", TraceController, :search
     end
 
     # Constitution frameworks
@@ -9,13 +9,28 @@ context file suitable for Claude Code hooks.
 Usage: python3 kudzu-context.py <memory_md_path>
 """
 
+import heapq
 import json
 import os
+import re
 import subprocess
 import sys
 import time
 from pathlib import Path
 
+# orjson is a much faster C parser; fall back to the stdlib when absent.
+# Both accept bytes, and orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -29,49 +44,174 @@ LINE_BUDGET = 180
 STATE_DIR = Path.home() / ".kudzu"
 HOLOGRAM_FILE = STATE_DIR / "session_holograms"
 PROJECTS_FILE = STATE_DIR / "projects.json"
+# OpenSSH multiplexing: the first ssh call spawns a master connection and
+# later calls reuse it over this socket instead of re-handshaking.
+SSH_CONTROL_PATH = STATE_DIR / "ssh-%r@%h:%p"
+SSH_CONTROL_PERSIST = "60s"
+# Short-lived cache for GETs whose results rarely change within a session.
+# Trace endpoints are never cached; freshness matters there.
+API_CACHE_FILE = STATE_DIR / "api_cache.json"
+API_CACHE_TTL = 30
+API_CACHE_PATHS = {"/api/v1/holograms"}
+# Remembers whether the server has optional endpoints (e.g. trace search).
+# A "not supported" answer is re-probed after a day in case Kudzu was upgraded.
+API_FEATURES_FILE = STATE_DIR / "api_features.json"
+API_FEATURES_TTL = 24 * 60 * 60
+# This script is network-latency bound: each SSH round-trip costs ~100ms
+# while parsing and rendering every trace takes a few ms. Concurrency
+# therefore belongs on the I/O side (one batched API call, parallel curls
+# on the remote host, ControlMaster connection reuse), never in a process
+# pool, whose interpreter start-up would dwarf the CPU work. Do not add
+# multiprocessing here.
+NETWORK_BOUND = True
+# Exit codes meaning Kudzu could not be reached at all: ssh's own failures
+# (255) and curl's "couldn't connect" (7) / "timed out" (28)
+UNREACHABLE_RCS = {7, 28, 255}
 
 # Keywords used to classify general traces into sub-sections
-WORKFLOW_KEYWORDS = {"commit", "rsync", "deploy", "ssh", "git", "workflow",
-                     "build", "make", "docker", "screen", "tmux", "script"}
-FACT_KEYWORDS = {"machine", "repo", "path", "url", "host", "server", "api",
-                 "port", "directory", "ip", "address", "endpoint", "config"}
+WORKFLOW_KEYWORDS = frozenset({"commit", "rsync", "deploy", "ssh", "git", "workflow",
+                               "build", "make", "docker", "screen", "tmux", "script"})
+FACT_KEYWORDS = frozenset({"machine", "repo", "path", "url", "host", "server", "api",
+                           "port", "directory", "ip", "address", "endpoint", "config"})
+# One-pass substring matchers for the keyword sets above
+WORKFLOW_RE = re.compile("|".join(map(re.escape, sorted(WORKFLOW_KEYWORDS))))
+FACT_RE = re.compile("|".join(map(re.escape, sorted(FACT_KEYWORDS))))
+
+# ---------------------------------------------------------------------------
+# State directory
+# ---------------------------------------------------------------------------
+
+state_dir_ready = False
+
+
+def ensure_state_dir() -> None:
+    """Create STATE_DIR if needed; only touches the filesystem once per run."""
+    global state_dir_ready
+    if not state_dir_ready:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        state_dir_ready = True
+
 
 # ---------------------------------------------------------------------------
 # SSH / API helpers
 # ---------------------------------------------------------------------------
 
-def ssh_cmd(remote_cmd: str, timeout: int = SSH_TIMEOUT + CURL_TIMEOUT + 5) -> str:
-    """Run a command on the Kudzu host via SSH. Returns stdout or raises."""
+class KudzuUnreachable(RuntimeError):
+    """The Kudzu host or API did not answer (as opposed to an API error)."""
+
+
+def ssh_cmd(remote_cmd: str, timeout: int = SSH_TIMEOUT + CURL_TIMEOUT + 5,
+            stdin_bytes: bytes = None) -> bytes:
+    """Run a command on the Kudzu host via SSH. Returns raw stdout or raises.
+
+    If stdin_bytes is given it is piped to the remote command's stdin.
+    Raises KudzuUnreachable on connection failures and timeouts.
+    """
     args = [
         "ssh",
         "-o", f"ConnectTimeout={SSH_TIMEOUT}",
         "-o", "ServerAliveInterval=30",
         "-o", "BatchMode=yes",
-        KUDZU_HOST,
-        remote_cmd,
     ]
-    result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+    # ssh exits if it cannot create the control socket, so only multiplex
+    # once STATE_DIR is known to exist
+    if state_dir_ready:
+        args += [
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={SSH_CONTROL_PATH}",
+            "-o", f"ControlPersist={SSH_CONTROL_PERSIST}",
+        ]
+    args += [KUDZU_HOST, remote_cmd]
+    try:
+        result = subprocess.run(args, input=stdin_bytes, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        raise KudzuUnreachable(f"SSH timed out after {timeout}s") from e
     if result.returncode != 0:
-        raise RuntimeError(f"SSH failed (rc={result.returncode}): {result.stderr.strip()}")
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        error = KudzuUnreachable if result.returncode in UNREACHABLE_RCS else RuntimeError
+        raise error(f"SSH failed (rc={result.returncode}): {stderr}")
     return result.stdout
 
 
+def cache_get(key: str, ttl: int = API_CACHE_TTL):
+    """Return the cached API response for key if younger than ttl, else None."""
+    try:
+        now = time.time()
+        # Whole file older than the TTL means every entry is stale
+        if now - os.path.getmtime(API_CACHE_FILE) > ttl:
+            return None
+        entry = json_loads(API_CACHE_FILE.read_bytes()).get(key)
+        if entry and now - entry["time"] <= ttl:
+            return entry["value"]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def cache_put(key: str, value, ttl: int = API_CACHE_TTL) -> None:
+    """Store an API response in the cache file, dropping expired entries."""
+    try:
+        cache = json_loads(API_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        cache = {}
+    now = time.time()
+    if isinstance(cache, dict):
+        cache = {k: v for k, v in cache.items()
+                 if isinstance(v, dict) and now - v.get("time", 0) <= ttl}
+    else:
+        cache = {}
+    cache[key] = {"time": now, "value": value}
+    try:
+        ensure_state_dir()
+        tmp = API_CACHE_FILE.with_suffix(".tmp")
+        tmp.write_bytes(json_dumps(cache))
+        os.replace(tmp, API_CACHE_FILE)
+    except OSError:
+        pass
+
+
 def api_get(path: str) -> dict:
-    """GET a JSON endpoint on the Kudzu API."""
+    """GET a JSON endpoint on the Kudzu API.
+
+    Paths in API_CACHE_PATHS are served from the on-disk cache when fresh.
+    """
+    cacheable = path in API_CACHE_PATHS
+    if cacheable:
+        cached = cache_get(path)
+        if cached is not None:
+            return cached
     raw = ssh_cmd(f"curl -s --max-time {CURL_TIMEOUT} '{KUDZU_URL}{path}'")
-    return json.loads(raw)
+    data = json_loads(raw)
+    if cacheable:
+        cache_put(path, data)
+    return data
 
 
 def api_post(path: str, body: dict) -> dict:
-    """POST JSON to a Kudzu API endpoint using base64 transport."""
-    import base64
-    encoded = base64.b64encode(json.dumps(body).encode()).decode()
+    """POST JSON to a Kudzu API endpoint, streaming the body over SSH stdin."""
     raw = ssh_cmd(
-        f"echo '{encoded}' | base64 -d | "
         f"curl -s --max-time {CURL_TIMEOUT} -X POST "
-        f"'{KUDZU_URL}{path}' -H 'Content-Type: application/json' -d @-"
+        f"'{KUDZU_URL}{path}' -H 'Content-Type: application/json' --data-binary @-",
+        stdin_bytes=json_dumps(body),
+    )
+    return json_loads(raw)
+
+
+def api_post_status(path: str, body: dict) -> tuple:
+    """POST JSON like api_post, but return (http_status, raw_body) unparsed.
+
+    curl appends the status code on its own line after the body.
+    """
+    raw = ssh_cmd(
+        f"curl -s --max-time {CURL_TIMEOUT} -w '\\n%{{http_code}}' -X POST "
+        f"'{KUDZU_URL}{path}' -H 'Content-Type: application/json' --data-binary @-",
+        stdin_bytes=json_dumps(body),
     )
-    return json.loads(raw)
+    raw_body, _, status = raw.rpartition(b"\n")
+    try:
+        return int(status), raw_body
+    except ValueError:
+        return 0, raw
 
 
 # ---------------------------------------------------------------------------
@@ -99,7 +239,10 @@ def load_hologram_ids() -> dict:
 
 
 def discover_hologram_ids() -> dict:
-    """Discover hologram IDs from the API and save them."""
+    """Discover hologram IDs from the API and save them.
+
+    API errors yield empty IDs; KudzuUnreachable propagates to the caller.
+    """
     purpose_map = {
         "claude_memory": "MEMORY_ID",
         "claude_research": "RESEARCH_ID",
@@ -113,6 +256,8 @@ def discover_hologram_ids() -> dict:
             purpose = h.get("purpose", "")
             if purpose in purpose_map:
                 ids[purpose_map[purpose]] = h.get("id", "")
+    except KudzuUnreachable:
+        raise
     except Exception:
         pass
 
@@ -122,7 +267,7 @@ def discover_hologram_ids() -> dict:
 def save_hologram_ids(ids: dict) -> None:
     """Persist hologram IDs to the state file with mode 600."""
     try:
-        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        ensure_state_dir()
         content = "\n".join(f"{k}={v}" for k, v in sorted(ids.items()) if v) + "\n"
         HOLOGRAM_FILE.write_text(content)
         os.chmod(HOLOGRAM_FILE, 0o600)
@@ -160,7 +305,7 @@ def get_project_holograms() -> list:
     """
     try:
         if PROJECTS_FILE.exists():
-            data = json.loads(PROJECTS_FILE.read_text())
+            data = json_loads(PROJECTS_FILE.read_bytes())
             if isinstance(data, dict):
                 return [(name, info["id"]) for name, info in data.items()
                         if isinstance(info, dict) and info.get("id")]
@@ -169,15 +314,153 @@ def get_project_holograms() -> list:
     return []
 
 
-def fetch_traces(hologram_id: str, limit: int = TRACE_LIMIT) -> list:
-    """Fetch traces from a hologram. Returns list of trace dicts."""
-    if not hologram_id:
-        return []
+# The only trace fields read downstream; everything else is dropped at parse
+TRACE_FIELDS = ("purpose", "reconstruction_hint", "timestamp")
+
+
+def project_traces(traces: list) -> list:
+    """Reduce a list of API trace dicts to slim dicts with TRACE_FIELDS."""
+    return [{k: t[k] for k in TRACE_FIELDS if k in t}
+            for t in traces if isinstance(t, dict)]
+
+
+TRACE_MARKER = b"===ID==="
+
+
+def dedupe_trace_ids(ids: list) -> list:
+    """Collapse repeated hologram IDs to one (id, limit) with the largest limit.
+
+    A project in PROJECTS_FILE may point at a core hologram, or two projects
+    may share one; each hologram is fetched once and sliced per consumer.
+    """
+    limits = {}
+    for hid, limit in ids:
+        if hid:
+            limits[hid] = max(limit, limits.get(hid, limit))
+    return list(limits.items())
+
+
+def fetch_traces_bulk(ids: list) -> dict:
+    """Fetch traces from several holograms in one SSH round-trip.
+
+    Takes a list of (hologram_id, limit) tuples. The remote side runs all
+    curls in parallel, then prints each response behind a marker line so the
+    combined stdout can be split back apart here.
+    Returns {hologram_id: [trace, ...]}; holograms that fail map to [].
+    Raises KudzuUnreachable if SSH fails to connect or no curl got an answer.
+    """
+    ids = dedupe_trace_ids(ids)
+    if not ids:
+        return {}
+
+    script = ['d=$(mktemp -d)']
+    for n, (hid, limit) in enumerate(ids):
+        script.append(
+            f"curl -s --max-time {CURL_TIMEOUT} "
+            f"'{KUDZU_URL}/api/v1/holograms/{hid}/traces?limit={limit}' > \"$d/{n}\" &"
+        )
+    script.append("wait")
+    for n, (hid, _) in enumerate(ids):
+        script.append(f"echo '{TRACE_MARKER.decode()}{hid}'; cat \"$d/{n}\"; echo")
+    script.append('rm -rf "$d"')
+
+    result = {hid: [] for hid, _ in ids}
     try:
-        data = api_get(f"/api/v1/holograms/{hologram_id}/traces?limit={limit}")
-        return data.get("traces", [])
+        raw = ssh_cmd("\n".join(script))
+    except KudzuUnreachable:
+        raise
     except Exception:
-        return []
+        return result
+
+    # Markers always start a line; JSON bodies never contain raw newlines
+    answered = False
+    for chunk in (b"\n" + raw).split(b"\n" + TRACE_MARKER)[1:]:
+        hid, _, body = chunk.partition(b"\n")
+        # curl -s prints nothing when it cannot connect or times out
+        answered = answered or bool(body.strip())
+        try:
+            traces = json_loads(body).get("traces", [])
+            result[hid.strip().decode()] = project_traces(traces)
+        except (ValueError, AttributeError):
+            pass
+    if not answered:
+        raise KudzuUnreachable("no response from Kudzu API")
+    return result
+
+
+def load_api_features() -> dict:
+    """Load the cached server feature-detection results."""
+    try:
+        data = json_loads(API_FEATURES_FILE.read_bytes())
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_api_features(features: dict) -> None:
+    """Persist server feature-detection results."""
+    try:
+        ensure_state_dir()
+        API_FEATURES_FILE.write_bytes(json_dumps(features))
+    except OSError:
+        pass
+
+
+def fetch_traces_batch(ids: list) -> dict:
+    """Fetch traces from several holograms with one server-side batch call.
+
+    Takes (hologram_id, limit) tuples like fetch_traces_bulk. Uses
+    POST /api/v1/traces/search when the server has it and falls back to
+    fetch_traces_bulk otherwise. A 404 from the endpoint is remembered in
+    API_FEATURES_FILE; any other failure falls back for this run only.
+    Returns {hologram_id: [trace, ...]}; the lists are shared, so callers
+    that fetch one hologram for several consumers must copy before mutating.
+    """
+    ids = dedupe_trace_ids(ids)
+    if not ids:
+        return {}
+
+    features = load_api_features()
+    known = features.get("traces_search")
+    if (isinstance(known, dict) and not known.get("supported")
+            and time.time() - known.get("time", 0) < API_FEATURES_TTL):
+        return fetch_traces_bulk(ids)
+
+    try:
+        status, raw = api_post_status("/api/v1/traces/search", {
+            "hologram_ids": [hid for hid, _ in ids],
+            "limit": max(limit for _, limit in ids),
+        })
+    except KudzuUnreachable:
+        raise
+    except Exception:
+        return fetch_traces_bulk(ids)
+
+    if status == 404:
+        # Older server without the endpoint
+        features["traces_search"] = {"supported": False, "time": time.time()}
+        save_api_features(features)
+        return fetch_traces_bulk(ids)
+
+    try:
+        data = json_loads(raw)
+        by_id = data.get("traces") if isinstance(data, dict) else None
+    except ValueError:
+        by_id = None
+    if status != 200 or not isinstance(by_id, dict):
+        # Transient failure (e.g. a 500 debug page); don't record a result
+        return fetch_traces_bulk(ids)
+
+    if not isinstance(known, dict) or not known.get("supported"):
+        features["traces_search"] = {"supported": True, "time": time.time()}
+        save_api_features(features)
+
+    # The server applies one limit to every hologram; trim per hologram here
+    result = {}
+    for hid, limit in ids:
+        traces = by_id.get(hid)
+        result[hid] = project_traces(traces[:limit]) if isinstance(traces, list) else []
+    return result
 
 
 def extract_content(trace: dict) -> str:
@@ -211,12 +494,15 @@ def extract_recency(trace: dict) -> int:
     Higher = more recent. Falls back to 0 if parsing fails.
     """
     ts = trace.get("timestamp", {})
+    recency = 0
     if isinstance(ts, dict):
         # The vector clock is {"node_id": N} — higher N = more recent
-        # May have multiple node entries; use the max value
-        values = [v for v in ts.values() if isinstance(v, (int, float))]
-        return max(values) if values else 0
-    return 0
+        # May have multiple node entries; use the max value. Counters are
+        # non-negative, so folding from 0 matches max() without a list.
+        for v in ts.values():
+            if isinstance(v, (int, float)) and v > recency:
+                recency = v
+    return recency
 
 
 # ---------------------------------------------------------------------------
@@ -239,9 +525,11 @@ SKIP_CONTENT_PREFIXES = (
 DEDUP_EXACT: set = set()
 
 
-def categorize_trace(trace: dict, content: str) -> str:
+def categorize_trace(trace: dict, content: str, normalized: str = None) -> str:
     """Map a trace to a MEMORY.md section name.
 
+    `normalized` is the stripped, lowercased content if the caller already
+    has it; keyword matching only needs the lowercase form.
     Returns one of: Learnings, Recent Decisions, Workflows, Key Facts,
     Current State, Active Projects, or empty string for traces to skip.
     """
@@ -267,7 +555,7 @@ def categorize_trace(trace: dict, content: str) -> str:
     if trace.get("_project"):
         return "Active Projects"
 
-    content_lower = content.lower()
+    content_lower = normalized if normalized is not None else content.lower()
 
     if purpose in ("learning", "discovery", "research"):
         return "Learnings"
@@ -281,9 +569,9 @@ def categorize_trace(trace: dict, content: str) -> str:
         return "Current State"
 
     # General traces: observation, thought, memory, or unknown
-    if any(kw in content_lower for kw in WORKFLOW_KEYWORDS):
+    if WORKFLOW_RE.search(content_lower):
         return "Workflows"
-    if any(kw in content_lower for kw in FACT_KEYWORDS):
+    if FACT_RE.search(content_lower):
         return "Key Facts"
     return "Current State"
 
@@ -295,8 +583,9 @@ def categorize_trace(trace: dict, content: str) -> str:
 def deduplicate(items: list) -> list:
     """Remove entries where a shorter string is a substring of a longer one.
 
-    Each item is a (content, recency) tuple. Keeps the longer/more-recent
-    version when duplicates are found.
+    Each item is a (content, normalized, recency) tuple, where normalized
+    is content.strip().lower(). Returns (content, recency) tuples, keeping
+    the longer/more-recent version when duplicates are found.
     """
     if not items:
         return items
@@ -304,16 +593,22 @@ def deduplicate(items: list) -> list:
     # Sort by content length descending so longer items come first
     sorted_items = sorted(items, key=lambda x: len(x[0]), reverse=True)
     kept = []
-
-    for content, recency in sorted_items:
-        normalized = content.strip().lower()
-        is_dup = False
-        for existing_content, _ in kept:
-            if normalized in existing_content.strip().lower():
-                is_dup = True
-                break
-        if not is_dup:
-            kept.append((content, recency))
+    kept_norms = []
+    # Kept strings joined by NUL: one C-level `in` scan replaces a Python
+    # loop over kept items, and no match can span two entries.
+    haystack = ""
+
+    for content, normalized, recency in sorted_items:
+        if kept:
+            if "\0" in normalized:
+                if any(normalized in existing for existing in kept_norms):
+                    continue
+            elif normalized in haystack:
+                continue
+            haystack += "\0"
+        haystack += normalized
+        kept_norms.append(normalized)
+        kept.append((content, recency))
 
     return kept
 
@@ -341,30 +636,33 @@ def build_sections(all_traces: list) -> dict:
     sections = {s: [] for s in SECTION_ORDER}
     seen_dedup = {}  # content -> best recency so far
 
-    # Pre-pass: find the highest recency for each DEDUP_EXACT content
+    # Pre-pass: extract content and recency once per trace, and find the
+    # highest recency for each DEDUP_EXACT content
+    extracted = []
     for trace in all_traces:
         content = extract_content(trace)
+        recency = extract_recency(trace)
+        extracted.append((trace, content, recency))
         if content in DEDUP_EXACT:
-            recency = extract_recency(trace)
             if content not in seen_dedup or recency > seen_dedup[content]:
                 seen_dedup[content] = recency
 
-    for trace in all_traces:
-        content = extract_content(trace)
+    for trace, content, recency in extracted:
         if not content or content in ("{}", "{}"):
             continue
         # Skip test/canary traces
-        if any(content.startswith(prefix) for prefix in SKIP_CONTENT_PREFIXES):
+        if content.startswith(SKIP_CONTENT_PREFIXES):
             continue
-        recency = extract_recency(trace)
         # For repetitive traces, only keep the most recent instance
         if content in DEDUP_EXACT and recency < seen_dedup.get(content, 0):
             continue
-        section = categorize_trace(trace, content)
+        # Normalize once; shared by categorization and deduplication
+        normalized = content.strip().lower()
+        section = categorize_trace(trace, content, normalized)
         if not section:
             continue
         if section in sections:
-            sections[section].append((content, recency))
+            sections[section].append((content, normalized, recency))
 
     # Deduplicate within each section
     for section in sections:
@@ -375,9 +673,16 @@ def build_sections(all_traces: list) -> dict:
     return sections
 
 
+# Line-breaking whitespace flattened to spaces in single-line output
+NEWLINE_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+
 def truncate_line(text: str, max_len: int = 120) -> str:
     """Truncate a single line to max_len characters."""
-    text = text.replace("\n", " ").strip()
+    # Only translate (and allocate a copy) when there is something to flatten
+    if "\n" in text or "\r" in text or "\t" in text:
+        text = text.translate(NEWLINE_TABLE)
+    text = text.strip()
     if len(text) > max_len:
         return text[:max_len - 3] + "..."
     return text
@@ -434,11 +739,19 @@ def render_memory_md(sections: dict) -> str:
             share = 1
         per_section[name] = share
 
-    # Adjust to not exceed budget
-    while sum(per_section.values()) > available and any(v > 1 for v in per_section.values()):
-        # Shrink the largest section
-        largest = max(per_section, key=per_section.get)
-        per_section[largest] -= 1
+    # Adjust to not exceed budget: shrink the largest section one line at a
+    # time (earliest section wins ties) via a max-heap, stopping at 1 each
+    overflow = sum(per_section.values()) - available
+    if overflow > 0:
+        heap = [(-share, i, name) for i, (name, share) in enumerate(per_section.items())]
+        heapq.heapify(heap)
+        while overflow > 0:
+            neg_share, i, name = heapq.heappop(heap)
+            if neg_share >= -1:
+                break
+            per_section[name] -= 1
+            overflow -= 1
+            heapq.heappush(heap, (neg_share + 1, i, name))
 
     # Render with wrapping — count lines as we go to stay within budget
     for name, items in active_sections:
@@ -521,14 +834,16 @@ def print_summary(sections: dict) -> None:
     section_names = ", ".join(name for name, _ in active)
     print(f"[kudzu-context] Loaded {total} traces into {len(active)} sections: {section_names}")
 
-    # Show the top 3 most recent items across all sections
-    all_items = []
-    for name, items in active:
-        for content, recency in items[:3]:
-            all_items.append((name, content, recency))
-    all_items.sort(key=lambda x: x[2], reverse=True)
+    # Show the top 3 most recent items across all sections. Sections are
+    # already sorted by recency, so only each section's first 3 can qualify.
+    top_items = heapq.nlargest(
+        3,
+        ((name, content, recency) for name, items in active
+         for content, recency in items[:3]),
+        key=lambda x: x[2],
+    )
 
-    for name, content, _ in all_items[:3]:
+    for name, content, _ in top_items:
         line = truncate_line(content, 90)
         print(f"  [{name}] {line}")
 
@@ -544,63 +859,68 @@ def main():
 
     memory_md_path = Path(sys.argv[1])
 
-    # Ensure parent directory exists
-    memory_md_path.parent.mkdir(parents=True, exist_ok=True)
+    # Ensure parent directory exists (one stat in the common case)
+    if not os.path.isdir(memory_md_path.parent):
+        os.makedirs(memory_md_path.parent, exist_ok=True)
+    # The SSH control socket lives in STATE_DIR; if it can't be created,
+    # ssh runs without connection multiplexing
+    try:
+        ensure_state_dir()
+    except OSError:
+        pass
 
-    # Step 1: Check Kudzu health
-    kudzu_reachable = False
+    # There is no separate health probe: the first real API call (discovery
+    # when the state file is incomplete, otherwise the trace fetch) raises
+    # KudzuUnreachable if the host or API is down.
     try:
-        health = api_get("/health")
-        if health.get("status") == "ok":
-            kudzu_reachable = True
-    except Exception as e:
+        # Step 1: Get hologram IDs
+        ids = get_hologram_ids()
+        memory_id = ids.get("MEMORY_ID", "")
+        research_id = ids.get("RESEARCH_ID", "")
+        learning_id = ids.get("LEARNING_ID", "")
+
+        if not any([memory_id, research_id, learning_id]):
+            memory_md_path.write_text(render_fallback_md("no holograms found"))
+            print("[kudzu-context] No hologram IDs found", file=sys.stderr)
+            print("[kudzu-context] Wrote fallback MEMORY.md")
+            return
+
+        # Step 2: Fetch traces from all holograms
+        # Core and project holograms are fetched together in one call
+        core_ids = [hid for hid in (memory_id, research_id, learning_id) if hid]
+        project_holograms = get_project_holograms()
+        fetched = fetch_traces_batch(
+            [(hid, TRACE_LIMIT) for hid in core_ids]
+            + [(pid, 20) for _, pid in project_holograms]
+        )
+    except KudzuUnreachable as e:
         # Write fallback and exit gracefully
         memory_md_path.write_text(render_fallback_md(str(e)[:80]))
         print(f"[kudzu-context] Kudzu unreachable: {e}", file=sys.stderr)
         print("[kudzu-context] Wrote fallback MEMORY.md")
         return
 
-    if not kudzu_reachable:
-        memory_md_path.write_text(render_fallback_md("health check failed"))
-        print("[kudzu-context] Kudzu health check failed", file=sys.stderr)
-        print("[kudzu-context] Wrote fallback MEMORY.md")
-        return
-
-    # Step 2: Get hologram IDs
-    ids = get_hologram_ids()
-    memory_id = ids.get("MEMORY_ID", "")
-    research_id = ids.get("RESEARCH_ID", "")
-    learning_id = ids.get("LEARNING_ID", "")
-
-    if not any([memory_id, research_id, learning_id]):
-        memory_md_path.write_text(render_fallback_md("no holograms found"))
-        print("[kudzu-context] No hologram IDs found", file=sys.stderr)
-        print("[kudzu-context] Wrote fallback MEMORY.md")
-        return
-
-    # Step 3: Fetch traces from all holograms
+    # A hologram can be both core and a project (or shared by projects);
+    # give each consumer its own slice and copies before tagging
     all_traces = []
+    for hid in core_ids:
+        all_traces.extend(dict(t) for t in fetched.get(hid, [])[:TRACE_LIMIT])
 
-    for hid in [memory_id, research_id, learning_id]:
-        all_traces.extend(fetch_traces(hid))
-
-    # Also fetch from project holograms, tagging with project name
-    project_holograms = get_project_holograms()
-    project_id_to_name = {hid: name for name, hid in project_holograms}
+    # Tag project hologram traces with the project name
     for name, pid in project_holograms:
-        traces = fetch_traces(pid, limit=20)
+        traces = [dict(t) for t in fetched.get(pid, [])[:20]]
         for t in traces:
             t["_project"] = name  # tag for rendering
         all_traces.extend(traces)
 
-    # Step 4: Build sections
+    # Step 3: Build sections
     sections = build_sections(all_traces)
 
-    # Step 5: Render and write MEMORY.md
+    # Step 4: Render and write MEMORY.md
     md_content = render_memory_md(sections)
     memory_md_path.write_text(md_content)
 
-    # Step 6: Print summary to stdout
+    # Step 5: Print summary to stdout
     print_summary(sections)
 
 
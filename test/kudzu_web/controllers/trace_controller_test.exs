@@ -0,0 +1,63 @@
+defmodule KudzuWeb.TraceControllerTest do
+  use ExUnit.Case, async: false
+
+  import Phoenix.ConnTest
+  import Plug.Conn
+
+  alias Kudzu.Hologram
+
+  @endpoint KudzuWeb.MCP.Endpoint
+
+  setup do
+    # KUDZU_API_KEY may enable auth at runtime; these tests exercise the action
+    previous_auth = Application.get_env(:kudzu, :api_auth)
+    Application.put_env(:kudzu, :api_auth, enabled: false, api_keys: [])
+    on_exit(fn -> Application.put_env(:kudzu, :api_auth, previous_auth) end)
+
+    {:ok, h} = Kudzu.Application.spawn_hologram(purpose: :test)
+    on_exit(fn -> Kudzu.Application.stop_hologram(h) end)
+
+    for i <- 1..3 do
+      {:ok, _} = Hologram.record_trace(h, :test_purpose, %{content: "trace #{i}"})
+    end
+
+    %{id: Hologram.get_id(h)}
+  end
+
+  defp search(body) do
+    build_conn()
+    |> put_req_header("content-type", "application/json")
+    |> post("/api/v1/traces/search", Jason.encode!(body))
+    |> json_response(200)
+  end
+
+  describe "POST /api/v1/traces/search" do
+    test "groups traces by hologram id", %{id: id} do
+      body = search(%{"hologram_ids" => [id]})
+
+      traces = body["traces"][id]
+      assert length(traces) >= 3
+      assert Enum.all?(traces, &Map.has_key?(&1, "reconstruction_hint"))
+      assert body["missing"] == []
+    end
+
+    test "lists unknown hologram ids as missing", %{id: id} do
+      body = search(%{"hologram_ids" => [id, "no-such-hologram"]})
+
+      assert Map.keys(body["traces"]) == [id]
+      assert body["missing"] == ["no-such-hologram"]
+    end
+
+    test "applies the limit to each hologram", %{id: id} do
+      body = search(%{"hologram_ids" => [id], "limit" => 2})
+
+      assert length(body["traces"][id]) == 2
+    end
+
+    test "accepts string, float and null limits", %{id: id} do
+      assert length(search(%{"hologram_ids" => [id], "limit" => "1"})["traces"][id]) == 1
+      assert length(search(%{"hologram_ids" => [id], "limit" => 2.0})["traces"][id]) == 2
+      assert length(search(%{"hologram_ids" => [id], "limit" => nil})["traces"][id]) >= 3
+    end
+  end
+end